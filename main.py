@@ -1,5 +1,4 @@
 from src.cli import cli
-from src.logging import setup_logger
 
 if __name__ == "__main__":
     # Initialize logger
@@ -1,5 +1,4 @@
 import click
-import traceback
 import os
 
 from src.filestructuregenerator.tree.file_tree_node import FileTreeNode
@@ -28,19 +27,27 @@ def cli(obj: dict, traceback: bool):
     default=False,
     help="Include hidden files in the file tree",
 )
+@click.option(
+    "--parallel",
+    is_flag=True,
+    default=False,
+    help="Scan directories in parallel (faster on slow network drives)",
+)
 @click.pass_obj
-def build(obj: dict, source: str, add_hidden: bool):
+def build(obj: dict, source: str, add_hidden: bool, parallel: bool):
     """Builds the file tree from the specified directory"""
     try:
         dir_name = os.path.basename(os.path.dirname(source))
         ft: FileTreeNode = FileTreeNode(dir_name, "directory")
-        ft.build_from_directory(source, add_hidden=add_hidden)
+        ft.build_from_directory(source, add_hidden=add_hidden, parallel=parallel)
         obj["ft"] = ft  # Save the FileTreeNode object in the context
         click.echo("File tree built successfully.")
     except Exception as e:
         click.echo(f"An error occurred while building: {e}")
         click.echo("use the --traceback flag for more details.")
         if obj.get("traceback"):
+            import traceback
+
             traceback.print_exc()
         raise click.Abort()
 
@@ -61,6 +68,8 @@ def load(obj: dict, input: str):
         click.echo("use the --traceback flag for more details.")
 
         if obj.get("traceback"):
+            import traceback
+
             traceback.print_exc()
         raise click.Abort()
 
@@ -95,6 +104,8 @@ def save(obj: dict, output: str, overwrite: bool):
         click.echo(f"An error occurred while saving: {e}")
         click.echo("use the --traceback flag for more details.")
         if obj.get("traceback"):
+            import traceback
+
             traceback.print_exc()
         raise click.Abort()
 
@@ -130,6 +141,8 @@ def template(obj: dict, destination: str, overwrite: bool):
         click.echo(f"An error occurred while creating the template: {e}")
         click.echo("use the --traceback flag for more details.")
         if obj.get("traceback"):
+            import traceback
+
             traceback.print_exc()
         raise click.Abort()
 
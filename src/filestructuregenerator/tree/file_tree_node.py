@@ -1,19 +1,47 @@
-from typing import Optional, List
+from __future__ import annotations
 
+from collections import deque
+
+import io
 import os
-import json
+import sys
+import errno
+
+# Use orjson for (de)serialization if it is available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# With parallel=True, directories up to this depth are scanned one per task
+_PARALLEL_DEPTH = 2
+_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Buffer size used when writing the serialized tree to a file
+_WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Content written to every file of a template copy
+_TEMPLATE_BYTES = b"This is an empty template file"
+
+# Tree branch connectors and the prefix continuations used by print_tree
+_CONN_LAST = "  └─"
+_CONN_MID = "  ├─"
+_CONT_LAST = "   "
+_CONT_MID = "  │"
 
 # ==================================================================================
 
 
 class FileTreeNode:
 
+    __slots__ = ("name", "type", "children")
+
     def __init__(
         self,
         name: str = "",
         type_str: str = "",
-        children: Optional[List["FileTreeNode"]] = None,
-        file_path: Optional[str] = None,
+        children: list[FileTreeNode] | None = None,
+        file_path: str | None = None,
     ):
 
         # If a filepath is given, try to load the root directory from it
@@ -45,52 +73,190 @@ class FileTreeNode:
 
     # ------------------------------------------------------------------------------
 
-    def build_from_directory(self, dir_path: str, add_hidden: bool = False) -> None:
-
-        if not os.path.isdir(dir_path):
-            raise ValueError(f"Path '{dir_path}' does not point to a directory.")
-
-        items = os.listdir(dir_path)
-
-        if not add_hidden:
-            items = [item for item in items if not item.startswith(".")]
-
-        dirs = [item for item in items if os.path.isdir(os.path.join(dir_path, item))]
-        for dir in dirs:
-            self.children.append(FileTreeNode(dir, "directory"))
+    def build_from_directory(
+        self, dir_path: str, add_hidden: bool = False, parallel: bool = False
+    ) -> None:
+        # Let scandir check the root path instead of stat-ing it up front
+        try:
+            subdirs = FileTreeNode.__scan_directory(self, dir_path, add_hidden)
+        except (FileNotFoundError, NotADirectoryError):
+            raise ValueError(
+                f"Path '{dir_path}' does not point to a directory."
+            ) from None
 
-        for child in self.children:
-            child.build_from_directory(os.path.join(dir_path, child.name))
+        # Scanning holds the GIL for most of its work, so threads only pay off
+        # where listing a directory is slow, e.g. on network mounts
+        if not parallel or not subdirs:
+            FileTreeNode.__build_subtrees(subdirs, add_hidden)
+            return
 
-        files = [item for item in items if os.path.isfile(os.path.join(dir_path, item))]
-        for file in files:
-            self.children.append(FileTreeNode(file, "file"))
+        # Imported here, as only parallel builds need the thread pool
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+        # Scan the top levels one directory per task and build everything below
+        # _PARALLEL_DEPTH as one sequential subtree per task. Only this thread
+        # waits on futures, so the workers never block each other.
+        with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+            pending = {}
+            try:
+                for child, path in subdirs:
+                    future = executor.submit(
+                        FileTreeNode.__scan_directory, child, path, add_hidden
+                    )
+                    pending[future] = 1
+
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        depth = pending.pop(future)
+                        for child, path in future.result():
+                            if depth < _PARALLEL_DEPTH:
+                                child_future = executor.submit(
+                                    FileTreeNode.__scan_directory,
+                                    child,
+                                    path,
+                                    add_hidden,
+                                )
+                            else:
+                                child_future = executor.submit(
+                                    FileTreeNode.__build_subtrees,
+                                    [(child, path)],
+                                    add_hidden,
+                                )
+                            pending[child_future] = depth + 1
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+
+    @staticmethod
+    def __build_subtrees(
+        subdirs: list[tuple[FileTreeNode, str]], add_hidden: bool
+    ) -> list[tuple[FileTreeNode, str]]:
+        # Walk the directories with an explicit stack instead of recursion
+        stack = deque(subdirs)
+        while stack:
+            node, path = stack.pop()
+            stack.extend(FileTreeNode.__scan_directory(node, path, add_hidden))
+
+        # The whole subtrees are built, so there is nothing left to schedule
+        return []
+
+    @staticmethod
+    def __scan_directory(
+        node: FileTreeNode, dir_path: str, add_hidden: bool
+    ) -> list[tuple[FileTreeNode, str]]:
+        dirs = []
+        files = []
+
+        # Single pass over the directory. The file type usually comes with
+        # the directory listing, otherwise DirEntry stats the entry once and
+        # caches the result for both is_dir and is_file
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                name = entry.name
+                if not add_hidden and name.startswith("."):
+                    continue
+
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append((name, entry.path))
+                elif entry.is_dir():
+                    # List symlinked directories, but don't descend into them
+                    # to avoid cycles
+                    dirs.append((name, None))
+                elif entry.is_file():
+                    files.append(name)
+
+        # Build the nodes, directories first, then files
+        subdirs = []
+        for name, path in dirs:
+            child = FileTreeNode(name, "directory")
+            node.children.append(child)
+            if path is not None:
+                subdirs.append((child, path))
+
+        node.children.extend(FileTreeNode(name, "file") for name in files)
+
+        return subdirs
 
     # ------------------------------------------------------------------------------
 
-    def __serialize(self) -> str:
-        def node_to_dict(node: FileTreeNode) -> dict:
+    def __serialize(self, file) -> None:
+        # orjson calls __encode_node for every FileTreeNode it meets, so no
+        # intermediate dict tree is built up front
+        # (orjson only supports an indentation of 2 spaces)
+        if orjson is not None:
+            try:
+                data = orjson.dumps(
+                    self,
+                    default=FileTreeNode.__encode_node,
+                    option=orjson.OPT_INDENT_2,
+                )
+            except orjson.JSONEncodeError:
+                # orjson gives up after 255 levels of nesting, i.e. for trees
+                # deeper than ~127 directories. Nothing has been written yet,
+                # so fall back to the json module below.
+                pass
+            else:
+                file.write(data)
+                return
+
+        import json
+
+        # json's default hook costs several Python frames per tree level and is
+        # slower than plain dicts, so hand it a dict tree instead.
+        # json.dump writes chunk by chunk, so the whole string never exists at once.
+        text_file = io.TextIOWrapper(file, encoding="utf-8")
+        try:
+            json.dump(
+                FileTreeNode.__to_dict(self),
+                text_file,
+                ensure_ascii=False,
+                indent=4,
+            )
+        finally:
+            # Flush and hand the binary file back without closing it
+            text_file.detach()
+
+    @staticmethod
+    def __encode_node(node: FileTreeNode) -> dict:
+        if not isinstance(node, FileTreeNode):
+            raise TypeError(f"Object of type {type(node).__name__} is not serializable")
+
+        # Keys are already in sorted order, so the encoders don't need to sort.
+        # Files have no children, so the key is left out for them entirely
+        if node.type == "directory":
             return {
+                "children": node.children,
                 "name": node.name,
                 "type": node.type,
-                "children": (
-                    [node_to_dict(child) for child in node.children]
-                    if node.children
-                    else None
-                ),
             }
 
-        return json.dumps(
-            node_to_dict(self), ensure_ascii=False, indent=4, sort_keys=True
-        )
-
-    def __deserialize(self, data: dict) -> "FileTreeNode":
+        return {"name": node.name, "type": node.type}
+
+    @staticmethod
+    def __to_dict(root: FileTreeNode) -> dict:
+        # Convert the tree level by level with an explicit stack
+        root_dict = FileTreeNode.__encode_node(root)
+        stack = [root_dict]
+        while stack:
+            node_dict = stack.pop()
+            children = node_dict.get("children")
+            if children:
+                node_dict["children"] = [
+                    FileTreeNode.__encode_node(child) for child in children
+                ]
+                stack.extend(node_dict["children"])
+
+        return root_dict
+
+    def __deserialize(self, data: dict) -> FileTreeNode:
         def dict_to_node(node_dict: dict) -> FileTreeNode:
             name = node_dict["name"]
             type_str = node_dict["type"]
             children = (
                 [dict_to_node(child) for child in node_dict["children"]]
-                if node_dict["children"]
+                if node_dict.get("children")
                 else None
             )
             return FileTreeNode(name, type_str, children)
@@ -100,21 +266,46 @@ class FileTreeNode:
     # ------------------------------------------------------------------------------
 
     def save_to_file(self, file_path: str, overwrite: bool = False):
-        if os.path.exists(file_path) and os.path.isfile(file_path) and not overwrite:
+        # Let open fail on existing files instead of checking for them up front
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        if not overwrite:
+            flags |= os.O_EXCL
+
+        try:
+            fd = os.open(file_path, flags, 0o666)
+        except FileExistsError:
+            # O_EXCL also fails on directories, report those like open() does
+            if os.path.isdir(file_path):
+                raise IsADirectoryError(
+                    errno.EISDIR, os.strerror(errno.EISDIR), file_path
+                ) from None
             print(
                 f"File '{file_path}' already exists. Use --overwrite to overwrite it."
             )
             return
 
-        with open(file_path, "w", encoding="utf-8") as file:
-            file.write(self.__serialize())
+        try:
+            with os.fdopen(fd, "wb", buffering=_WRITE_BUFFER_SIZE) as file:
+                self.__serialize(file)
+        except BaseException:
+            # The file was created or truncated above, don't leave a partial
+            # tree behind that blocks the next save without --overwrite
+            os.unlink(file_path)
+            raise
 
         print(f"File tree saved to {file_path}")
 
-    def __load_from_file(self, file_path: str) -> "FileTreeNode":
-        with open(file_path, "r", encoding="utf-8") as file:
-            data = json.load(file)
-            return self.__deserialize(data)
+    def __load_from_file(self, file_path: str) -> FileTreeNode:
+        with open(file_path, "rb") as file:
+            raw = file.read()
+
+        if orjson is not None:
+            data = orjson.loads(raw)
+        else:
+            import json
+
+            data = json.loads(raw)
+        return self.__deserialize(data)
 
     # ------------------------------------------------------------------------------
 
@@ -133,50 +324,91 @@ class FileTreeNode:
             print(f"Path '{root_path}' already exists. Skipping creation.")
             return
 
-        # Create files or directories and sub-directories recursively
+        # Collect the paths of all leaf directories and files first
+        leaf_dirs = []
+        files = []
+        stack = deque([(self, root_path)])
+        while stack:
+            node, path = stack.pop()
+            if node.type == "directory":
+                is_leaf = True
+                for child in node.children:
+                    is_leaf = is_leaf and child.type != "directory"
+                    stack.append((child, os.path.join(path, child.name)))
+                if is_leaf:
+                    leaf_dirs.append(path)
+            elif node.type == "file":
+                files.append(path)
+            else:
+                raise ValueError(
+                    f"Unknown type '{node.type}' for node '{node.name}'. Expected 'file' or 'directory'."
+                )
+
+        # An existing root directory raises FileExistsError, so everything
+        # below it is newly created
         if self.type == "directory":
             os.makedirs(root_path)
-            for child in self.children:
-                child.create_template_copy(root_path)
-        elif self.type == "file":
-            with open(root_path, "w") as file:
-                file.write("This is an empty template file")
-        else:
-            raise ValueError(
-                f"Unknown type '{self.type}' for node '{self.name}'. Expected 'file' or 'directory'."
-            )
-
-    # ------------------------------------------------------------------------------
 
-    def print_tree(
-        self, indent=0, print_hidden=False, is_last_child=True, prefix=""
-    ) -> None:
-        if not print_hidden and self.name.startswith("."):
-            return
+        # makedirs creates all parent directories along the way
+        for path in leaf_dirs:
+            os.makedirs(path, exist_ok=True)
 
-        # Set up the tree branch prefixes
-        connector = "  └─" if is_last_child else "  ├─"
+        # Only a file root may be overwritten, never replace files inside the tree
+        flags = os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        flags |= os.O_TRUNC if self.type == "file" else os.O_EXCL
 
-        # Print the current file or directory
-        if self.type == "file":
-            print(f"{prefix + connector}📄 {self.name}")
-        elif self.type == "directory":
-            print(f"{prefix + connector}📁 {self.name}")
+        for path in files:
+            try:
+                fd = os.open(path, flags, 0o666)
+            except FileExistsError:
+                print(f"Path '{path}' already exists. Skipping creation.")
+                continue
 
-            # Update the prefix for children
-            new_prefix = prefix + ("   " if is_last_child else "  │")
+            try:
+                os.write(fd, _TEMPLATE_BYTES)
+            finally:
+                os.close(fd)
 
-            # Sort children: directories first, then files, each alphabetically
-            sorted_children = sorted(
-                self.children, key=lambda x: (x.type != "directory", x.name.lower())
-            )
+    # ------------------------------------------------------------------------------
 
-            # Recursively print children with updated prefix and indentation
-            for i, child in enumerate(sorted_children):
-                is_last_child = i == len(sorted_children) - 1
-                child.print_tree(
-                    indent=indent + 1,
-                    print_hidden=print_hidden,
-                    is_last_child=is_last_child,
-                    prefix=new_prefix,
-                )
+    def print_tree(
+        self, indent=0, print_hidden=False, is_last_child=True, prefix=""
+    ) -> None:
+        # Collect all lines first and write them to stdout at once
+        buf = io.StringIO()
+
+        # Print the tree with an explicit stack of (node, prefix, is_last_child)
+        stack = deque([(self, prefix, is_last_child)])
+        while stack:
+            node, prefix, is_last_child = stack.pop()
+
+            if not print_hidden and node.name.startswith("."):
+                continue
+
+            # Set up the tree branch prefixes
+            connector = _CONN_LAST if is_last_child else _CONN_MID
+
+            # Print the current file or directory
+            if node.type == "file":
+                buf.write(f"{prefix}{connector}📄 {node.name}\n")
+            elif node.type == "directory":
+                buf.write(f"{prefix}{connector}📁 {node.name}\n")
+
+                # Update the prefix for children
+                new_prefix = prefix + (_CONT_LAST if is_last_child else _CONT_MID)
+
+                # Sort children: directories first, then files, each alphabetically
+                dirs = []
+                files = []
+                for child in node.children:
+                    (dirs if child.type == "directory" else files).append(child)
+                dirs.sort(key=lambda x: x.name.casefold())
+                files.sort(key=lambda x: x.name.casefold())
+                sorted_children = dirs + files
+
+                # Push children in reverse so they are popped in sorted order
+                last_index = len(sorted_children) - 1
+                for i in range(last_index, -1, -1):
+                    stack.append((sorted_children[i], new_prefix, i == last_index))
+
+        sys.stdout.write(buf.getvalue())